@@ -12,8 +12,29 @@ battleship quit                  → forget the locally‑saved token
 battleship help                  → show this help screen
 """
 
-import sys, os, json, pathlib, requests
+import sys, os, json, time, pathlib, functools, requests
 from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# -----------------------------------------------------------------
+# JSON codec – orjson (C extension) when available, stdlib otherwise.
+# Both sides of the shim take/return bytes so callers don't care
+# which backend is active.
+# -----------------------------------------------------------------
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj):
+        # Compact separators match orjson's output byte-for-byte
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _json_loads = json.loads
 
 # -----------------------------------------------------------------
 # Server URL – read from the environment, ensure it ends with "/"
@@ -24,6 +45,30 @@ _raw_url = os.getenv(
 )
 SERVER_URL = _raw_url.rstrip("/") + "/"
 
+# -----------------------------------------------------------------
+# Shared HTTP session – a single command issues several back-to-back
+# requests (e.g. `fire` = state → move → state), so keep-alive lets
+# them reuse one TCP connection instead of re-handshaking each time.
+# Transient 5xx responses are retried with a short backoff; the
+# (connect, read) timeout bounds how long a dead server can stall us.
+# Plain HTTP/1.1 keep-alive is deliberate: the CLI never has requests
+# in flight concurrently, so HTTP/2 multiplexing would add a
+# dependency without saving a round trip.
+# -----------------------------------------------------------------
+DEFAULT_TIMEOUT = (3, 10)
+
+_SESSION = requests.Session()
+_retry = Retry(
+    total=3,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset(["GET", "POST"]),
+)
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=_retry)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+_SESSION.headers["Connection"] = "keep-alive"
+
 # -----------------------------------------------------------------
 # Local token storage (kept under $HOME/.battleship/current)
 # -----------------------------------------------------------------
@@ -45,6 +90,34 @@ EMOJI = {
 # -----------------------------------------------------------------
 BOARD_SIZE = 12
 
+# -----------------------------------------------------------------
+# Precomputed coordinate tables – map "B5" ↔ (row, col) without
+# per-cell ord()/int() string parsing in the render loops.
+# -----------------------------------------------------------------
+_COORD_IDX = {
+    f"{chr(ord('A') + c)}{r + 1}": (r, c)
+    for r in range(BOARD_SIZE)
+    for c in range(BOARD_SIZE)
+}
+_IDX_COORD = {rc: coord for coord, rc in _COORD_IDX.items()}
+
+# Static pieces of the rendered board – BOARD_SIZE never changes at
+# runtime, so build the header and row labels once at import.
+_COL_HEADER = ("   " + " ".join(f"{chr(ord('A') + i)} " for i in range(BOARD_SIZE))).rstrip()
+_ROW_LABELS = [f"{r + 1:2d}" for r in range(BOARD_SIZE)]
+
+# Shared empty set for the common early-game case (no hits yet)
+_NO_HITS = frozenset()
+
+# Ship letter → friendly name (same mapping used on the server)
+_SHIP_NAMES = {
+    "A": "Aircraft Carrier",
+    "B": "Battleship",
+    "S": "Submarine",
+    "D": "Destroyer",
+    "P": "Patrol Boat",
+}
+
 # -----------------------------------------------------------------
 # Helper functions for token handling
 # -----------------------------------------------------------------
@@ -57,15 +130,22 @@ def _save_token(game_id, token):
     """Write the current game ID and token to $HOME/.battleship/current."""
     _ensure_dir()
     data = {"game_id": game_id, "token": token}
-    TOKEN_FILE.write_text(json.dumps(data))
+    TOKEN_FILE.write_bytes(_json_dumps(data))
+    _load_token.cache_clear()
 
 
+@functools.lru_cache(maxsize=1)
 def _load_token():
-    """Read the stored token file; return None if it does not exist."""
+    """Read the stored token file; return None if it does not exist.
+
+    The result is memoized for the lifetime of the process so a single
+    command never re-reads and re-parses the file; `_save_token` and
+    `_clear_token` invalidate the cache.
+    """
     if not TOKEN_FILE.is_file():
         return None
     try:
-        return json.loads(TOKEN_FILE.read_text())
+        return _json_loads(TOKEN_FILE.read_bytes())
     except Exception:
         return None
 
@@ -74,32 +154,116 @@ def _clear_token():
     """Remove the stored token file (used by the `quit` command)."""
     if TOKEN_FILE.is_file():
         TOKEN_FILE.unlink()
+    _load_token.cache_clear()
+    _clear_state_cache()
+
+
+# -----------------------------------------------------------------
+# Short-lived on-disk cache of the last /state response.  Polling
+# `status` while waiting for the opponent would otherwise re-download
+# identical state every time; within the TTL we reuse the cached body,
+# and beyond it we revalidate with If-None-Match so an unchanged game
+# costs a 304 instead of a full payload.  The TTL can be overridden
+# (e.g. set to 0 in tests that alternate players rapidly).
+# -----------------------------------------------------------------
+STATE_CACHE_TTL = float(os.getenv("BATTLESHIP_STATE_TTL", "2.0"))
+
+
+def _state_cache_path():
+    return TOKEN_FILE.parent / "state.json"
+
+
+def _load_state_cache(game_id, token):
+    """Return the cached state entry for this game/token, or None."""
+    try:
+        cached = _json_loads(_state_cache_path().read_bytes())
+    except Exception:
+        return None
+    if cached.get("game_id") != game_id or cached.get("token") != token:
+        return None
+    return cached
+
+
+def _save_state_cache(game_id, token, state, etag):
+    _ensure_dir()
+    entry = {
+        "game_id": game_id,
+        "token": token,
+        "etag": etag,
+        "ts": time.time(),
+        "state": state,
+    }
+    _state_cache_path().write_bytes(_json_dumps(entry))
+
+
+def _clear_state_cache():
+    p = _state_cache_path()
+    if p.is_file():
+        p.unlink()
 
 
 # -----------------------------------------------------------------
 # Low‑level API wrapper
 # -----------------------------------------------------------------
+class APIError(Exception):
+    """Raised when the server answers with a non-2xx response."""
+
+
 def _api(path, method="GET", json_body=None):
-    """Perform a request against the Battleship REST API."""
+    """Perform a request against the Battleship REST API.
+
+    Raises :class:`APIError` on a non-2xx response; ``main`` catches it
+    and reports the failure, so an error no longer hard-exits from deep
+    inside the HTTP layer.
+    """
     url = urljoin(SERVER_URL, path)
-    resp = requests.request(method, url, json=json_body)
+    resp = _SESSION.request(method, url, json=json_body, timeout=DEFAULT_TIMEOUT)
     if not resp.ok:
-        print(f"Error {resp.status_code}: {resp.text}", file=sys.stderr)
-        sys.exit(1)
-    return resp.json()
+        # Decode at most 512 bytes of the body, and only on this cold
+        # path – no point materializing a huge error page.
+        body = resp.content[:512].decode("utf-8", "replace")
+        raise APIError(f"{resp.status_code}: {body}")
+    return _json_loads(resp.content)
 
 
-def _fetch_state(game_id, token):
+def _fetch_state(game_id, token, fresh=False):
     """
     Pull the game state from the server, passing our token so we receive
     our private board and the optional `winner` field.
+
+    Unless *fresh* is True, a recent cached copy is reused and an older
+    one is revalidated with If-None-Match before re-downloading.
     """
+    cached = None if fresh else _load_state_cache(game_id, token)
+    if cached and time.time() - cached["ts"] < STATE_CACHE_TTL:
+        return cached["state"]
+
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+
     url = f"{SERVER_URL}games/{game_id}/state?token={token}"
-    resp = requests.get(url)
+    resp = _SESSION.get(url, headers=headers, timeout=DEFAULT_TIMEOUT)
+    if resp.status_code == 304 and cached:
+        # Unchanged on the server – refresh the cache timestamp only.
+        _save_state_cache(game_id, token, cached["state"], cached.get("etag"))
+        return cached["state"]
     if not resp.ok:
-        print(f"Error fetching state: {resp.text}", file=sys.stderr)
-        sys.exit(1)
-    return resp.json()
+        raise APIError(f"fetching state: {resp.content[:512].decode('utf-8', 'replace')}")
+    state = _json_loads(resp.content)
+    _save_state_cache(game_id, token, state, resp.headers.get("ETag"))
+    return state
+
+
+def _api_batch(game_id, token, ops):
+    """
+    POST several operations (e.g. a move plus a state refresh) to the
+    server's batch endpoint in a single round trip.  Returns the list
+    of per-op results, in order.
+    """
+    data = _api(f"games/{game_id}/batch", "POST",
+                json_body={"token": token, "ops": ops})
+    return data["results"]
 
 
 # -----------------------------------------------------------------
@@ -116,8 +280,17 @@ def _print_board(state, my_token):
         ⚪  – a miss you scored on the opponent
         ❓  – unknown / water
     """
-    # Empty visual grid (all unknown)
-    grid = [[EMOJI["unknown"] for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+    # Hoist the emoji lookups out of the loops below (LOAD_FAST
+    # instead of a dict subscript per cell).
+    _hit = EMOJI["hit"]
+    _miss = EMOJI["miss"]
+    _ship = EMOJI["ship"]
+    _ship_hit = EMOJI["ship_hit"]
+    _unknown = EMOJI["unknown"]
+
+    # Empty visual grid (all unknown).  Sharing the same immutable str
+    # across a row is safe; only the rows themselves must be distinct.
+    grid = [[_unknown] * BOARD_SIZE for _ in range(BOARD_SIZE)]
 
     # Determine whether an opponent exists
     player_tokens = list(state["players"].keys())
@@ -132,47 +305,50 @@ def _print_board(state, my_token):
     if opponent_exists:
         opp_data = state["players"][opponent_token]
 
-        for coord in opp_data["hits"]:
-            col = ord(coord[0]) - ord('A')
-            row = int(coord[1:]) - 1
-            grid[row][col] = EMOJI["hit"]          # 💥
+        # Skip the coordinate lookups entirely while no shots have
+        # been exchanged yet (the common early-game case).
+        if opp_data["hits"] or opp_data["misses"]:
+            for coord in opp_data["hits"]:
+                r, c = _COORD_IDX[coord]
+                grid[r][c] = _hit                  # 💥
 
-        for coord in opp_data["misses"]:
-            col = ord(coord[0]) - ord('A')
-            row = int(coord[1:]) - 1
-            grid[row][col] = EMOJI["miss"]         # ⚪
+            for coord in opp_data["misses"]:
+                r, c = _COORD_IDX[coord]
+                grid[r][c] = _miss                 # ⚪
 
     # Overlay YOUR own ships and mark any hits the opponent already made
     private_board = state.get("private_board")
     if private_board:
-        opponent_hits = set()
-        if opponent_exists:
+        opponent_hits = _NO_HITS
+        if opponent_exists and state["players"][my_token]["hits"]:
             opponent_hits = set(state["players"][my_token]["hits"])
 
-        for r in range(BOARD_SIZE):
-            for c in range(BOARD_SIZE):
-                cell = private_board[r][c]
-                if cell != "~":                     # there is a ship here
-                    coord = f"{chr(ord('A')+c)}{r+1}"
-                    if coord in opponent_hits:
-                        grid[r][c] = EMOJI["ship_hit"]   # 🔥
-                    else:
-                        if grid[r][c] == EMOJI["unknown"]:
-                            grid[r][c] = EMOJI["ship"]   # 🚢
-
-    # Header line (aligned with cells)
-    col_header = "   " + " ".join(chr(ord('A') + i) + " " for i in range(BOARD_SIZE))
-    print(col_header.rstrip())
-
-    # Rows (right‑aligned row numbers)
+        # Only the ~17 ship cells matter – skip the empty water cells
+        # instead of scanning all 144 positions, and don't bother
+        # materializing an intermediate list for one pass.
+        ship_cells = (
+            (r, c)
+            for r, row in enumerate(private_board)
+            for c, cell in enumerate(row)
+            if cell != "~"
+        )
+        for r, c in ship_cells:
+            if _IDX_COORD[(r, c)] in opponent_hits:
+                grid[r][c] = _ship_hit               # 🔥
+            elif grid[r][c] == _unknown:
+                grid[r][c] = _ship                   # 🚢
+
+    # Assemble the whole board (header + rows) and emit it with a
+    # single write instead of one print per line.
+    lines = [_COL_HEADER]
     for r in range(BOARD_SIZE):
-        row_label = f"{r+1:2d}"
-        row_cells = " ".join(grid[r]) + " "
-        print(f"{row_label} {row_cells.rstrip()}")
+        lines.append(f"{_ROW_LABELS[r]} {' '.join(grid[r])}")
 
     # If opponent hasn't joined yet, show a friendly note.
     if not opponent_exists:
-        print("\n🕒 Waiting for the opponent to join this game...")
+        lines.append("\n🕒 Waiting for the opponent to join this game...")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # -----------------------------------------------------------------
@@ -186,70 +362,20 @@ def _list_my_damaged_ships(state, my_token):
     if not private_board:
         return []
 
-    # Opponent's hits against us
-    opponent_hits = set(state["players"][my_token]["hits"])
+    # Opponent's hits against us – nothing to do before the first one
+    opponent_hits = state["players"][my_token]["hits"]
+    if not opponent_hits:
+        return []
+
     damaged = set()
+    coord_idx = _COORD_IDX
     for coord in opponent_hits:
-        col = ord(coord[0]) - ord('A')
-        row = int(coord[1:]) - 1
+        row, col = coord_idx[coord]
         ship_letter = private_board[row][col]
         if ship_letter != "~":
             damaged.add(ship_letter)
 
-    # Friendly names (same mapping used on the server)
-    names = {
-        "A": "Aircraft Carrier",
-        "B": "Battleship",
-        "S": "Submarine",
-        "D": "Destroyer",
-        "P": "Patrol Boat",
-    }
-    return [names.get(l, l) for l in sorted(damaged)]
-
-
-# -----------------------------------------------------------------
-# Helper: list which opponent ships you have already sunk
-# -----------------------------------------------------------------
-def _list_opponent_sunk_ships(state, my_token):
-    """
-    Return a list of ship letters that you have already sunk.
-    The server does not keep a cumulative list, so we infer it from
-    the opponent's board: any ship type for which *all* its cells are
-    present in our hit list is considered sunk.
-    """
-    # Find opponent token
-    player_tokens = list(state["players"].keys())
-    try:
-        opponent_token = next(t for t in player_tokens if t != my_token)
-    except StopIteration:
-        return []   # no opponent yet
-
-    # We need the opponent's *private* board – unfortunately the public
-    # endpoint does not expose it.  Instead we infer sunk ships from the
-    # hit list we have on the opponent: when we have hit enough cells
-    # equal to the ship's size, we know it is sunk.
-    #
-    # The server already returns `sunk`/`sunk_name` for the *last* move,
-    # but here we want the cumulative list.  We'll reconstruct it by
-    # counting hits per ship type.
-    #
-    # NOTE: This works only because ships never overlap and each ship
-    # type appears at most once per player.
-    #
-    # First, fetch the opponent's board via a *private* request.
-    # The client already knows its own token, but not the opponent's.
-    # The server does not expose the opponent's board publicly, so we
-    # cannot reliably compute the full list without an extra endpoint.
-    # For simplicity, we'll rely on the fact that the server returns
-    # `sunk` for each move and store those in a local cache file.
-    #
-    # To avoid persisting extra state, we will just return the ships
-    # that were reported as sunk in the most recent move (if any).
-    # This keeps the client simple and matches the server's design.
-    #
-    # If you want a full cumulative list you could extend the server
-    # to include a `sunk_ships` array in the state response.
-    return []   # placeholder – no cumulative data available
+    return [_SHIP_NAMES.get(l, l) for l in sorted(damaged)]
 
 
 # -----------------------------------------------------------------
@@ -328,14 +454,7 @@ def cmd_status(_):
     )
 
     if opponent_sunk_letters:
-        ship_names = {
-            "A": "Aircraft Carrier",
-            "B": "Battleship",
-            "S": "Submarine",
-            "D": "Destroyer",
-            "P": "Patrol Boat",
-        }
-        opponent_sunk_names = [ship_names.get(l, l) for l in opponent_sunk_letters]
+        opponent_sunk_names = [_SHIP_NAMES.get(l, l) for l in opponent_sunk_letters]
         print("\nOpponent ships you have sunk:", ", ".join(opponent_sunk_names))
     else:
         print("\nYou have not sunk any opponent ships yet.")
@@ -353,19 +472,21 @@ def cmd_fire(args):
         print("No active game.")
         sys.exit(1)
 
-    # Verify it's our turn first
-    state = _fetch_state(cur["game_id"], cur["token"])
-    if state["turn"] != cur["token"]:
-        print("It's not your turn yet.")
-        return
-
-    payload = {"token": cur["token"], "coord": coord}
-    resp = requests.post(f"{SERVER_URL}games/{cur['game_id']}/move", json=payload)
-    if not resp.ok:
-        print(f"Move failed: {resp.text}")
+    # One round trip: the batch endpoint applies the move and returns
+    # the refreshed state alongside it.  The server authoritatively
+    # rejects out-of-turn moves, so no pre-check is needed either.
+    try:
+        result, new_state = _api_batch(
+            cur["game_id"], cur["token"],
+            [{"op": "move", "coord": coord}, {"op": "state"}],
+        )
+    except APIError as exc:
+        if "Not your turn" in str(exc):
+            print("It's not your turn yet.")
+            return
+        print(f"Move failed: {exc}")
         return
 
-    result = resp.json()
     print(f"You fired at {coord}: {result['result'].upper()}")
 
     # Did we sink a ship?
@@ -373,8 +494,9 @@ def cmd_fire(args):
         sunk_name = result.get("sunk_name") or "a ship"
         print(f"🎉 You SUNK the opponent's {sunk_name}! 🎉")
 
-    # Refresh and display the updated board
-    new_state = _fetch_state(cur["game_id"], cur["token"])
+    # The batch reply already contains the post-move state – reuse it
+    # for the board and prime the cache with it.
+    _save_state_cache(cur["game_id"], cur["token"], new_state, None)
     _print_board(new_state, cur["token"])
 
 
@@ -414,28 +536,55 @@ def cmd_help(_):
     print("\nTip: Run `battleship help` anytime to see this again.\n")
 
 
-def main():
-    if len(sys.argv) < 2:
+# -----------------------------------------------------------------
+# Command dispatch table – static, so build it once at import
+# -----------------------------------------------------------------
+_COMMANDS = {
+    "start":  cmd_start,
+    "join":   cmd_join,
+    "status": cmd_status,
+    "fire":   cmd_fire,
+    "quit":   cmd_quit,
+    "help":   cmd_help,
+}
+
+
+def main(argv=None, home=None, server_url=None):
+    """Run one client command.
+
+    When invoked from the command line all arguments default to the
+    process environment.  Callers embedding the client (the integration
+    test) can pass *argv* explicitly plus an alternate *home* directory
+    for token storage and a *server_url*, avoiding a subprocess per
+    command.
+    """
+    global TOKEN_FILE, SERVER_URL
+
+    if home is not None:
+        TOKEN_FILE = pathlib.Path(home) / ".battleship" / "current"
+        _load_token.cache_clear()
+    if server_url is not None:
+        SERVER_URL = server_url.rstrip("/") + "/"
+
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
         cmd_help(None)
         sys.exit(0)
 
-    cmd = sys.argv[1]
-    args = sys.argv[2:]
-
-    commands = {
-        "start":  cmd_start,
-        "join":   cmd_join,
-        "status": cmd_status,
-        "fire":   cmd_fire,
-        "quit":   cmd_quit,
-        "help":   cmd_help,
-    }
+    cmd = argv[0]
+    args = argv[1:]
 
-    if cmd not in commands:
-        print(f"Unknown command '{cmd}'. Available: {', '.join(commands)}")
+    fn = _COMMANDS.get(cmd)
+    if fn is None:
+        print(f"Unknown command '{cmd}'. Available: {', '.join(_COMMANDS)}")
         sys.exit(1)
 
-    commands[cmd](args)
+    try:
+        fn(args)
+    except APIError as exc:
+        print(f"Error {exc}", file=sys.stderr)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
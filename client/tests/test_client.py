@@ -34,25 +34,26 @@ class TestBattleshipClient(unittest.TestCase):
     @patch('battleship.TOKEN_FILE')
     def test_save_load_token(self, mock_token_file):
         mock_token_file.parent.mkdir = MagicMock()
-        mock_token_file.write_text = MagicMock()
-        mock_token_file.read_text = MagicMock(return_value='{"game_id": "123", "token": "abc"}')
+        mock_token_file.write_bytes = MagicMock()
+        mock_token_file.read_bytes = MagicMock(return_value=b'{"game_id": "123", "token": "abc"}')
         mock_token_file.is_file = MagicMock(return_value=True)
 
         battleship._save_token("123", "abc")
-        mock_token_file.write_text.assert_called_with('{"game_id": "123", "token": "abc"}')
+        expected = battleship._json_dumps({"game_id": "123", "token": "abc"})
+        mock_token_file.write_bytes.assert_called_with(expected)
 
         token_data = battleship._load_token()
         self.assertEqual(token_data, {"game_id": "123", "token": "abc"})
 
-    @patch('battleship.requests')
+    @patch('battleship._SESSION')
     @patch('battleship._save_token')
-    def test_cmd_start(self, mock_save_token, mock_requests):
+    def test_cmd_start(self, mock_save_token, mock_session):
         # Mock responses
-        # The client uses _api which uses requests.request
-        mock_requests.request.return_value.ok = True
-        mock_requests.request.return_value.json.side_effect = [
-            {"game_id": "test_game"}, # start response
-            {"token": "test_token"}   # join response
+        # The client uses _api which goes through the shared session
+        # and parses resp.content itself
+        mock_session.request.side_effect = [
+            MagicMock(ok=True, content=b'{"game_id": "test_game"}'),  # start response
+            MagicMock(ok=True, content=b'{"token": "test_token"}'),   # join response
         ]
 
         battleship.cmd_start([])
@@ -60,12 +61,12 @@ class TestBattleshipClient(unittest.TestCase):
         mock_save_token.assert_called_with("test_game", "test_token")
         self.assertIn("New game created! ID = test_game", sys.stdout.getvalue())
 
-    @patch('battleship.requests')
+    @patch('battleship._SESSION')
     @patch('battleship._save_token')
-    def test_cmd_join(self, mock_save_token, mock_requests):
-        # The client uses _api which uses requests.request
-        mock_requests.request.return_value.ok = True
-        mock_requests.request.return_value.json.return_value = {"token": "test_token"}
+    def test_cmd_join(self, mock_save_token, mock_session):
+        # The client uses _api which goes through the shared session
+        # and parses resp.content itself
+        mock_session.request.return_value = MagicMock(ok=True, content=b'{"token": "test_token"}')
 
         battleship.cmd_join(["test_game"])
 
@@ -97,14 +98,14 @@ class TestBattleshipClient(unittest.TestCase):
         self.assertIn("Game in progress", output)
 
     @patch('battleship._load_token')
-    @patch('battleship._fetch_state')
-    @patch('battleship.requests')
-    def test_cmd_fire(self, mock_requests, mock_fetch_state, mock_load_token):
+    @patch('battleship._save_state_cache')
+    @patch('battleship._api_batch')
+    def test_cmd_fire(self, mock_api_batch, mock_save_state_cache, mock_load_token):
         mock_load_token.return_value = {"game_id": "test_game", "token": "my_token"}
 
-        # Initial state: my turn
+        # Post-move state returned alongside the move result
         mock_state = {
-            "turn": "my_token",
+            "turn": "op_token",
             "players": {
                 "my_token": {"hits": [], "misses": []},
                 "op_token": {"hits": [], "misses": []}
@@ -112,20 +113,25 @@ class TestBattleshipClient(unittest.TestCase):
             "private_board": [["~"]*12 for _ in range(12)],
             "winner": None
         }
-        mock_fetch_state.return_value = mock_state
 
-        # Mock fire response
-        # The client uses requests.post for fire
-        mock_requests.post.return_value.ok = True
-        mock_requests.post.return_value.json.return_value = {
-            "result": "hit",
-            "hit": True,
-            "sunk": "S",
-            "sunk_name": "Submarine"
-        }
+        # The client sends one batch request carrying the move + state ops
+        mock_api_batch.return_value = [
+            {
+                "result": "hit",
+                "hit": True,
+                "sunk": "S",
+                "sunk_name": "Submarine"
+            },
+            mock_state,
+        ]
 
         battleship.cmd_fire(["A1"])
 
+        mock_api_batch.assert_called_with(
+            "test_game", "my_token",
+            [{"op": "move", "coord": "A1"}, {"op": "state"}],
+        )
+
         output = sys.stdout.getvalue()
         self.assertIn("You fired at A1: HIT", output)
         self.assertIn("You SUNK the opponent's Submarine", output)
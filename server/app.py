@@ -9,12 +9,66 @@ If $SNAP_COMMON is not defined, the server falls back to a local
 "./games" directory (useful for development).
 """
 
-import os, json, uuid, random, string
+import os, copy, json, random, secrets, string, threading, uuid
+from collections import defaultdict
 from pathlib import Path
 from flask import Flask, request, jsonify, abort
 
 app = Flask(__name__)
 
+# ----------------------------------------------------------------------
+# JSON codec – orjson (C/SIMD) when available, stdlib otherwise.  The
+# shim is bytes-in/bytes-out so the game-file helpers below don't care
+# which backend is active, and Flask's own responses are routed through
+# orjson as well.
+# ----------------------------------------------------------------------
+try:
+    import orjson
+    from flask.json.provider import JSONProvider
+
+    class _OrjsonProvider(JSONProvider):
+        """Flask JSON provider backed by orjson."""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+        def response(self, *args, **kwargs):
+            obj = self._prepare_response_obj(args, kwargs)
+            # orjson emits bytes directly – skip the str round trip
+            return self._app.response_class(
+                orjson.dumps(obj) + b"\n", mimetype="application/json"
+            )
+
+    app.json = _OrjsonProvider(app)
+
+    def _json_dumps(data):
+        return orjson.dumps(data)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(data):
+        return json.dumps(data, separators=(",", ":")).encode()
+
+    _json_loads = json.loads
+
+
+def _request_json():
+    """Parse the request body straight through the orjson shim.
+
+    Skips Werkzeug's content-type negotiation and JSON wrapper – the
+    hot POST endpoints always carry JSON and read the raw bytes once.
+    """
+    try:
+        payload = _json_loads(request.get_data(cache=False))
+    except Exception:
+        abort(400, description="Request body is not valid JSON")
+    if not isinstance(payload, dict):
+        abort(400, description="Request body must be a JSON object")
+    return payload
+
 # ----------------------------------------------------------------------
 # Determine where the JSON files will live
 # ----------------------------------------------------------------------
@@ -32,6 +86,10 @@ BOARD_SIZE = 12
 # Ship definitions
 SHIP_SIZES = {"A": 5, "B": 4, "S": 3, "D": 3, "P": 2}   # Aircraft, Battleship, Sub, Destroyer, Patrol
 
+# Boards are flat bytearrays (one byte per cell, row-major); water cells
+# hold this byte value.
+_WATER = ord("~")
+
 # ----------------------------------------------------------------------
 # Helper utilities
 # ----------------------------------------------------------------------
@@ -40,63 +98,200 @@ def _rand_id():
     return "".join(random.choice(string.ascii_lowercase) for _ in range(6))
 
 
+# Shared all-water template; every new board is one memcpy of this.
+_EMPTY_BYTES = b"~" * (BOARD_SIZE * BOARD_SIZE)
+
+
 def _empty_board():
-    return [["~"] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+    # Flat BOARD_SIZE × BOARD_SIZE bytearray – contiguous memory, one
+    # allocation, and slice-based overlap checks during placement.
+    return bytearray(_EMPTY_BYTES)
+
+
+def _board_rows(board):
+    """Nested-list view of a flat *board*, as exposed in /state payloads."""
+    s = board.decode()
+    return [list(s[r * BOARD_SIZE:(r + 1) * BOARD_SIZE]) for r in range(BOARD_SIZE)]
+
+
+def _serialize_game(data):
+    """Return a JSON-ready copy of *data* (boards → strings, shot sets → lists)."""
+    out = copy.deepcopy(data)
+    for pdata in out["players"].values():
+        # One flat BOARD_SIZE² string: the parser sees a single token
+        # instead of a nested list of one-char strings.
+        pdata["board"] = bytes(pdata["board"]).decode()
+        pdata["hits"] = sorted(pdata["hits"])
+        pdata["misses"] = sorted(pdata["misses"])
+    return out
+
+
+def _deserialize_game(data):
+    """Inverse of :func:`_serialize_game` – boards to bytearrays, shots to sets."""
+    for pdata in data["players"].values():
+        pdata["board"] = bytearray(pdata["board"].encode())
+        pdata["hits"] = set(pdata["hits"])
+        pdata["misses"] = set(pdata["misses"])
+    return data
 
 
 def _game_path(game_id: str) -> Path:
     return GAMES_ROOT / f"{game_id}.json"
 
 
-def _save_game(game_id, data):
-    _game_path(game_id).write_text(json.dumps(data))
+# Process-local cache of parsed games: game_id → (file mtime, game dict).
+# The mtime check revalidates against writes made by other processes;
+# set CACHE_ENABLED=0 to force every load to hit the filesystem parser.
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "1") != "0"
+_CACHE = {}
+
+# One lock per game: concurrent mutating requests (join/move/batch) on
+# the same game serialize their load→mutate→save section instead of
+# racing each other, while different games still run in parallel.
+_GAME_LOCKS = defaultdict(threading.Lock)
+
+# Set DURABLE=1 to fsync each game file before the rename; demo traffic
+# skips the sync and relies on the atomic rename alone.
+#
+# Persistence deliberately stays one-JSON-file-per-game rather than a
+# database: the snap ships the games directory under $SNAP_COMMON, the
+# in-process cache already serves hot reads, and the atomic rename
+# above covers the torn-write concern a DB would otherwise solve.
+DURABLE = os.getenv("DURABLE", "0") == "1"
+
+# Upper bound on retained move-log entries per game (memory/file cap for
+# the ?since= delta responses).
+_LOG_LIMIT = 100
 
 
-def _load_game(game_id):
+def _save_game(game_id, data):
+    path = _game_path(game_id)
+    payload = _json_dumps(_serialize_game(data))
+
+    # Write to a temp file and rename over the target: a crash mid-write
+    # can never leave a torn/corrupt JSON file behind, and os.replace is
+    # a single atomic metadata operation.
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "wb", buffering=65536) as f:
+        f.write(payload)
+        if DURABLE:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if CACHE_ENABLED:
+        # Write-through: keep a pristine copy so later route-level
+        # mutations of *data* can't corrupt the cached snapshot.
+        _CACHE[game_id] = (path.stat().st_mtime_ns, copy.deepcopy(data))
+
+
+def _load_game(game_id, mutable=True):
+    """
+    Load a game, preferring the in-process cache when the file on disk
+    is unchanged.  Callers that mutate the result (join/move) get their
+    own deep copy; read-only callers can pass ``mutable=False`` to
+    share the cached object and skip the copy.
+    """
     p = _game_path(game_id)
-    if not p.is_file():
+    try:
+        st = p.stat()
+    except OSError:
         abort(404, description="Game not found")
-    return json.loads(p.read_text())
 
+    if CACHE_ENABLED:
+        entry = _CACHE.get(game_id)
+        if entry and entry[0] == st.st_mtime_ns:
+            return copy.deepcopy(entry[1]) if mutable else entry[1]
 
-def _coord_from_rc(row: int, col: int) -> str:
-    """Convert numeric row/col to a Battleship coordinate string, e.g. (0,0) → 'A1'."""
-    return f"{chr(ord('A') + col)}{row + 1}"
+    game = _deserialize_game(_json_loads(p.read_bytes()))
+    if CACHE_ENABLED:
+        _CACHE[game_id] = (st.st_mtime_ns, copy.deepcopy(game))
+    return game
 
 
-def _place_ships_randomly(board, blocked_coords=None):
+# ----------------------------------------------------------------------
+# Coordinate tables – flat board index ↔ "B5"-style coordinate string,
+# built once at import so hot paths never construct coordinate strings.
+# ----------------------------------------------------------------------
+COORD = tuple(
+    f"{chr(ord('A') + i % BOARD_SIZE)}{i // BOARD_SIZE + 1}"
+    for i in range(BOARD_SIZE * BOARD_SIZE)
+)
+RC = {s: (i // BOARD_SIZE, i % BOARD_SIZE) for i, s in enumerate(COORD)}
+
+
+def _placement_entry(sl):
+    """Pair a placement slice with its occupancy bitmask."""
+    mask = 0
+    for i in range(*sl.indices(BOARD_SIZE * BOARD_SIZE)):
+        mask |= 1 << i
+    return (sl, mask)
+
+
+def _enumerate_placements(size):
+    """All legal placements of a *size*-cell ship as (slice, mask) pairs."""
+    placements = []
+    # Horizontal placements
+    for r in range(BOARD_SIZE):
+        for c in range(BOARD_SIZE - size + 1):
+            start = r * BOARD_SIZE + c
+            placements.append(_placement_entry(slice(start, start + size)))
+    # Vertical placements (strided slice, one column)
+    for r in range(BOARD_SIZE - size + 1):
+        for c in range(BOARD_SIZE):
+            start = r * BOARD_SIZE + c
+            placements.append(
+                _placement_entry(slice(start, start + size * BOARD_SIZE, BOARD_SIZE)))
+    return tuple(placements)
+
+
+# Every valid placement per ship, enumerated once at import time.
+_PLACEMENTS = {ship: _enumerate_placements(size) for ship, size in SHIP_SIZES.items()}
+
+
+def _place_ships_randomly(board, blocked_coords=None, rng=None):
     """
     Randomly place ships on *board*.
 
     *blocked_coords* – a set of coordinate strings (e.g. {'A1','B2'})
     that must **not** be used for any ship cell.  This is used when the
     second player joins, to avoid overlapping the first player's ships.
+
+    *rng* – optional :class:`random.Random`; callers on the request path
+    pass a fresh instance so threads don't contend on the global
+    Mersenne Twister state.
+
+    Instead of rejection-sampling random positions, each ship walks its
+    precomputed placement table in shuffled order and takes the first
+    free spot – the first valid entry of a random permutation is still
+    uniform over the valid placements, and termination is guaranteed.
     """
     blocked_coords = blocked_coords or set()
+    rng = rng or random
+
+    # Occupancy as a single 144-bit int: a candidate collides iff its
+    # precomputed mask intersects it.  Seed the mask from the board and
+    # the blocked coordinates so the inner test is one AND.
+    occupied = 0
+    for i, cell in enumerate(board):
+        if cell != _WATER:
+            occupied |= 1 << i
+    for coord in blocked_coords:
+        col = ord(coord[0]) - ord('A')
+        row = int(coord[1:]) - 1
+        occupied |= 1 << (row * BOARD_SIZE + col)
 
     for ship, size in SHIP_SIZES.items():
-        placed = False
-        while not placed:
-            horiz = random.choice([True, False])
-            if horiz:
-                r = random.randint(0, BOARD_SIZE - 1)
-                c = random.randint(0, BOARD_SIZE - size)
-                cells = [(r, c + i) for i in range(size)]
-            else:
-                r = random.randint(0, BOARD_SIZE - size)
-                c = random.randint(0, BOARD_SIZE - 1)
-                cells = [(r + i, c) for i in range(size)]
-
-            # 1️⃣  Ensure none of the candidate cells overlap existing ships
-            # 2️⃣  Ensure none of the candidate cells are in *blocked_coords*
-            if any(board[x][y] != "~" for x, y in cells):
-                continue
-            if any(_coord_from_rc(x, y) in blocked_coords for x, y in cells):
+        ship_bytes = ship.encode() * size
+        candidates = list(_PLACEMENTS[ship])
+        rng.shuffle(candidates)
+        for sl, mask in candidates:
+            if occupied & mask:
                 continue
-
-            for x, y in cells:
-                board[x][y] = ship
-            placed = True
+            board[sl] = ship_bytes
+            occupied |= mask
+            break
+        else:
+            abort(500, description=f"No room left to place ship {ship}")
 
 
 # ----------------------------------------------------------------------
@@ -111,7 +306,9 @@ def start_game():
         "turn": None,
         "created": uuid.uuid4().hex,
         "winner": None,
-        "sunk_ships": {}             # <token> → list of ship letters this player has sunk
+        "sunk_ships": {},            # <token> → list of ship letters this player has sunk
+        "version": 0,                # bumped on every mutation; feeds the /state ETag
+        "log": []                    # [version, event] pairs for ?since= delta polling
     }
     _save_game(game_id, game)
     return jsonify({"game_id": game_id}), 201
@@ -119,134 +316,158 @@ def start_game():
 
 @app.route("/games/<game_id>/join", methods=["POST"])
 def join_game(game_id):
-    game = _load_game(game_id)
+    with _GAME_LOCKS[game_id]:
+        game = _load_game(game_id)
+
+        if len(game["players"]) >= 2:
+            abort(400, description="Game already has two players")
+
+        token = secrets.token_hex(16)
+        board = _empty_board()
+
+        # --------------------------------------------------------------
+        # If a player is already in the game, collect all of *their* ship
+        # coordinates so we can forbid them for the newcomer.
+        # --------------------------------------------------------------
+        blocked = set()
+        if game["players"]:                 # there is already one player
+            existing_board = next(iter(game["players"].values()))["board"]
+            for i, cell in enumerate(existing_board):
+                if cell != _WATER:
+                    blocked.add(COORD[i])
+
+        # Place ships respecting the blocked set (may be empty for the first player)
+
+        _place_ships_randomly(board, blocked_coords=blocked, rng=random.Random())
+
+        game["players"][token] = {
+            "board": board,
+            "hits": set(),   # opponent's successful shots on this board
+            "misses": set(), # opponent's missed shots on this board
+            "hit_counts": {k: 0 for k in SHIP_SIZES},  # hits taken, per ship
+            "opponent": None            # filled in once both players are present
+        }
 
-    if len(game["players"]) >= 2:
-        abort(400, description="Game already has two players")
+        # Cross-link the two players so later lookups are O(1) instead of
+        # scanning the players dict on every move.
+        if len(game["players"]) == 2:
+            first_token = next(t for t in game["players"] if t != token)
+            game["players"][first_token]["opponent"] = token
+            game["players"][token]["opponent"] = first_token
 
-    token = uuid.uuid4().hex
-    board = _empty_board()
+        # Ensure a slot for this player in the sunk‑ships dict
+        game["sunk_ships"][token] = []
 
-    # ------------------------------------------------------------------
-    # If a player is already in the game, collect all of *their* ship
-    # coordinates so we can forbid them for the newcomer.
-    # ------------------------------------------------------------------
-    blocked = set()
-    if game["players"]:                     # there is already one player
-        existing_board = next(iter(game["players"].values()))["board"]
-        for r in range(BOARD_SIZE):
-            for c in range(BOARD_SIZE):
-                if existing_board[r][c] != "~":
-                    blocked.add(_coord_from_rc(r, c))
-
-    # Place ships respecting the blocked set (may be empty for the first player)
-
-    _place_ships_randomly(board, blocked_coords=blocked)
-
-    game["players"][token] = {
-        "board": board,
-        "hits": [],      # opponent's successful shots on this board
-        "misses": []     # opponent's missed shots on this board
-    }
-
-    # Ensure a slot for this player in the sunk‑ships dict
-    game["sunk_ships"][token] = []
+        # First player to join gets the first turn
+        if game["turn"] is None:
+            game["turn"] = token
 
-    # First player to join gets the first turn
-    if game["turn"] is None:
-        game["turn"] = token
-
-    _save_game(game_id, game)
+        game["version"] = game.get("version", 0) + 1
+        _save_game(game_id, game)
     return jsonify({"token": token}), 200
 
 
-@app.route("/games/<game_id>/state", methods=["GET"])
-def get_state(game_id):
+def _build_state(game, game_id, requester_token):
     """
-    Return the public game state **plus**:
-      * the caller’s private board (if a valid token is supplied)
-      * a per‑player list ``sunk_ships`` – the enemy ships that this
-        player has already sunk (derived from their hit list).
-      * the existing ``winner`` field.
+    Assemble the state payload for *game*: the public part (hits/misses,
+    turn, per-player sunk ships, winner) plus the caller's private board
+    when *requester_token* identifies a player.
     """
-    game = _load_game(game_id)
-
     # -----------------------------------------------------------------
     # Public part – hits/misses for both players, whose turn it is.
     # -----------------------------------------------------------------
     public_players = {}
     for token, pdata in game["players"].items():
+        # In-memory these are sets; the wire format stays a JSON array.
         public_players[token] = {
-            "hits":   pdata["hits"],
-            "misses": pdata["misses"]
+            "hits":   sorted(pdata["hits"]),
+            "misses": sorted(pdata["misses"])
         }
 
     # -----------------------------------------------------------------
     # Compute, for each player, which enemy ships they have already sunk.
     # -----------------------------------------------------------------
     sunk_info = {}   # token → list of ship letters that the *opponent* has lost
-    for token in game["players"]:
-        # Find the opponent token (the other player)
-        opponent_token = next(t for t in game["players"] if t != token)
-        opponent_board = game["players"][opponent_token]["board"]
-        hits = set(game["players"][opponent_token]["hits"])
-
-        sunk_this_player = []
-        for ship_letter, size in SHIP_SIZES.items():
-            # Count how many cells of this ship type are present in the hit list
-            hit_count = sum(
-                1
-                for r in range(BOARD_SIZE)
-                for c in range(BOARD_SIZE)
-                if opponent_board[r][c] == ship_letter
-                and _coord_from_rc(r, c) in hits
-            )
-            if hit_count == size:
-                sunk_this_player.append(ship_letter)
-
-        sunk_info[token] = sunk_this_player
-
-    # -----------------------------------------------------------------
-    # Private board – only for the caller (if they passed a valid token)
-    # -----------------------------------------------------------------
-    requester_token = request.args.get("token")
-    private_board = None
-    if requester_token and requester_token in game["players"]:
-        private_board = game["players"][requester_token]["board"]
+    for token, pdata in game["players"].items():
+        opponent_token = pdata.get("opponent")
+        if opponent_token is None:      # waiting for the second player
+            sunk_info[token] = []
+            continue
+        # The per-ship hit counters are maintained incrementally by
+        # _apply_move, so a sunk ship is just a count that reached the
+        # ship's size – no board rescan needed.
+        counts = game["players"][opponent_token]["hit_counts"]
+        sunk_info[token] = [s for s, n in counts.items() if n == SHIP_SIZES[s]]
 
     # -----------------------------------------------------------------
     # Assemble the full JSON response
     # -----------------------------------------------------------------
-    response = {
+    state = {
         "id":            game_id,
+        "version":       game.get("version", 0),  # resync point for ?since= polling
         "turn":          game["turn"],
         "players":       public_players,
-        "private_board": private_board,          # may be None for unauthenticated callers
         "sunk_ships":    sunk_info,              # per‑player sunk‑enemy‑ship list
         "winner":        game.get("winner")      # unchanged from earlier version
     }
-    return jsonify(response), 200
 
+    # -----------------------------------------------------------------
+    # Private board – only for the caller (if they passed a valid token).
+    # Anonymous pollers don't get the key at all: no point serializing
+    # (or shipping) BOARD_SIZE rows of filler for them.
+    # -----------------------------------------------------------------
+    if requester_token and requester_token in game["players"]:
+        state["private_board"] = _board_rows(game["players"][requester_token]["board"])
 
-@app.route("/games/<game_id>/move", methods=["POST"])
-def make_move(game_id):
+    return state
+
+
+@app.route("/games/<game_id>/state", methods=["GET"])
+def get_state(game_id):
     """
-    Fire a shot at the opponent.
-    Expected JSON body: {"token":"…","coord":"B5"}
-    Returns JSON with result, hit flag, and optional sunk info.
+    Return the public game state **plus**:
+      * the caller’s private board (if a valid token is supplied)
+      * a per‑player list ``sunk_ships`` – the enemy ships that this
+        player has already sunk (derived from their hit list).
+      * the existing ``winner`` field.
     """
-    payload = request.get_json(force=True)
-    token = payload.get("token")
-    coord = payload.get("coord")
-
-    if not token or not coord:
+    game = _load_game(game_id, mutable=False)
+
+    # Pollers waiting for their turn hammer this endpoint; a weak ETag
+    # derived from the mutation counter lets an unchanged game answer
+    # with an empty 304 instead of a full serialize.
+    etag = f'W/"{game_id}-{game.get("version", 0)}"'
+    if request.headers.get("If-None-Match") == etag:
+        return "", 304
+
+    # Delta polling: ?since=<version> returns just the move events newer
+    # than the caller's version instead of the full state.  The log is
+    # bounded, so callers that have fallen behind what we retain get the
+    # full state back and should resync from it.
+    since = request.args.get("since", type=int)
+    if since is not None:
+        version = game.get("version", 0)
+        log = game.get("log", [])
+        if since >= version or (log and since >= log[0][0] - 1):
+            events = [e for v, e in log if v > since]
+            response = jsonify({"version": version, "events": events})
+            response.headers["ETag"] = etag
+            return response, 200
+
+    response = jsonify(_build_state(game, game_id, request.args.get("token")))
+    response.headers["ETag"] = etag
+    return response, 200
+
+
+def _apply_move(game, token, coord):
+    """
+    Validate and apply one shot by *token* at *coord*, mutating *game*
+    in place (hits/misses, turn switch, sunk bookkeeping, winner).
+    Returns the move-result dict; the caller persists the game.
+    """
+    if not coord or not isinstance(coord, str):
         abort(400, description="Missing token or coord")
 
-    game = _load_game(game_id)
-
-    if token not in game["players"]:
-        abort(403, description="Invalid token for this game")
-
     if game["turn"] != token:
         abort(400, description="Not your turn")
 
@@ -254,50 +475,44 @@ def make_move(game_id):
         abort(400, description="Opponent has not joined the game yet")
 
     # ------------------------------------------------------------------
-    # Locate opponent (the other token)
+    # Locate opponent via the pointer stored at join time
     # ------------------------------------------------------------------
-    opponent_token = next(t for t in game["players"] if t != token)
+    opponent_token = game["players"][token]["opponent"]
     opponent = game["players"][opponent_token]
 
     # ------------------------------------------------------------------
-    # Translate coordinate (e.g. "B5")
+    # Translate coordinate (e.g. "B5") – one table probe validates the
+    # format and the bounds at the same time.
     # ------------------------------------------------------------------
-    try:
-        col = ord(coord[0].upper()) - ord('A')
-        row = int(coord[1:]) - 1
-    except Exception:
+    coord = coord.upper()
+    rc = RC.get(coord)
+    if rc is None:
         abort(400, description="Coordinate format invalid (expected LetterNumber, e.g. B5)")
+    row, col = rc
 
-    if not (0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE):
-        abort(400, description="Coordinate out of bounds")
-
-    cell = opponent["board"][row][col]
-    hit = cell != "~"
-
+    cell = opponent["board"][row * BOARD_SIZE + col]
+    hit = cell != _WATER
     if hit:
-        opponent["hits"].append(coord.upper())
+        # O(1) membership makes repeated shots idempotent – the hit
+        # counter must only ever count a cell once.
+        if coord not in opponent["hits"]:
+            opponent["hits"].add(coord)
+            opponent["hit_counts"][chr(cell)] += 1
         result = "hit"
     else:
-        opponent["misses"].append(coord.upper())
+        opponent["misses"].add(coord)
         result = "miss"
 
     # ------------------------------------------------------------------
-    # Check for a sunk ship (corrected logic)
+    # Check for a sunk ship – the incremental counter already holds the
+    # number of hits on this ship, no walk over the hit list needed.
     # ------------------------------------------------------------------
     sunk_letter = None
     sunk_name = None
     if hit:
-        ship_letter = cell  # the letter of the ship we just hit
-
-        # Count how many of *this* ship's cells are present in opponent["hits"]
-        hits_on_this_ship = 0
-        for hit_coord in opponent["hits"]:
-            h_col = ord(hit_coord[0].upper()) - ord('A')
-            h_row = int(hit_coord[1:]) - 1
-            if opponent["board"][h_row][h_col] == ship_letter:
-                hits_on_this_ship += 1
+        ship_letter = chr(cell)  # the letter of the ship we just hit
 
-        if hits_on_this_ship == SHIP_SIZES.get(ship_letter, 0):
+        if opponent["hit_counts"][ship_letter] == SHIP_SIZES.get(ship_letter, 0):
             sunk_letter = ship_letter
             ship_names = {
                 "A": "Aircraft Carrier",
@@ -319,27 +534,92 @@ def make_move(game_id):
     # --------------------------------------------------------------
     if sunk_letter:
         # After this hit we may have sunk the *last* ship of the opponent.
-        # Verify that every ship type of the opponent is fully hit.
-        all_sunk = True
-        for s_letter, s_size in SHIP_SIZES.items():
-            hits_on_type = sum(
-                1 for c in opponent["hits"]
-                if opponent["board"][int(c[1:]) - 1][ord(c[0].upper()) - ord('A')] == s_letter
-            )
-            if hits_on_type < s_size:
-                all_sunk = False
-                break
-        if all_sunk:
+        if all(n == SHIP_SIZES[s] for s, n in opponent["hit_counts"].items()):
             game["winner"] = token   # the player who just moved wins
 
-    _save_game(game_id, game)
+    # ------------------------------------------------------------------
+    # Record the move in the event log so pollers can ask for a delta
+    # (?since=<version>) instead of the whole state.
+    # ------------------------------------------------------------------
+    game["version"] = version = game.get("version", 0) + 1
+    log = game.setdefault("log", [])
+    log.append([version, {
+        "type": "move",
+        "by": token,
+        "coord": coord,
+        "result": result,
+        "sunk": sunk_letter,
+        "winner": game.get("winner"),
+    }])
+    del log[:-_LOG_LIMIT]
 
-    return jsonify({
+    return {
         "result": result,
         "hit": hit,
         "sunk": sunk_letter,
         "sunk_name": sunk_name,
-    }), 200
+    }
+
+
+@app.route("/games/<game_id>/move", methods=["POST"])
+def make_move(game_id):
+    """
+    Fire a shot at the opponent.
+    Expected JSON body: {"token":"…","coord":"B5"}
+    Returns JSON with result, hit flag, and optional sunk info.
+    """
+    payload = _request_json()
+    token = payload.get("token")
+
+    if not token:
+        abort(400, description="Missing token or coord")
+
+    with _GAME_LOCKS[game_id]:
+        game = _load_game(game_id)
+
+        if token not in game["players"]:
+            abort(403, description="Invalid token for this game")
+
+        result = _apply_move(game, token, payload.get("coord"))
+        _save_game(game_id, game)
+    return jsonify(result), 200
+
+
+@app.route("/games/<game_id>/batch", methods=["POST"])
+def batch(game_id):
+    """
+    Execute several operations in one round trip.
+    Expected JSON body: {"token":"…","ops":[{"op":"move","coord":"B5"},{"op":"state"}]}
+    Returns {"results":[…]} with one entry per op, in order.
+    """
+    payload = _request_json()
+    token = payload.get("token")
+    ops = payload.get("ops")
+
+    if not token or not isinstance(ops, list) or not ops:
+        abort(400, description="Missing token or ops")
+
+    with _GAME_LOCKS[game_id]:
+        game = _load_game(game_id)
+
+        if token not in game["players"]:
+            abort(403, description="Invalid token for this game")
+
+        results = []
+        dirty = False
+        for op in ops:
+            kind = op.get("op") if isinstance(op, dict) else None
+            if kind == "move":
+                results.append(_apply_move(game, token, op.get("coord")))
+                dirty = True
+            elif kind == "state":
+                results.append(_build_state(game, game_id, token))
+            else:
+                abort(400, description=f"Unknown op {kind!r}")
+
+        if dirty:
+            _save_game(game_id, game)
+    return jsonify({"results": results}), 200
 
 
 # ----------------------------------------------------------------------
@@ -15,8 +15,10 @@ source .venv/bin/activate
 
 # Install dependencies
 echo "Installing dependencies..."
-pip install -r client/requirements.txt -r server/requirements.txt pytest coverage > /dev/null
+pip install -r client/requirements.txt -r server/requirements.txt pytest pytest-xdist coverage > /dev/null
 
 # Run tests
+# The tests are fully independent (each gets its own GAMES_ROOT / HOME),
+# so spread them across cores with pytest-xdist.
 echo "Running tests..."
-pytest server/tests/test_server.py client/tests/test_client.py test_integration.py
+pytest -n auto server/tests/test_server.py client/tests/test_client.py test_integration.py
@@ -1,4 +1,5 @@
 # test_integration.py
+import io
 import os
 import sys
 import json
@@ -8,9 +9,98 @@ import socket
 import shutil
 import tempfile
 import subprocess
+import contextlib
 import re
+from collections import namedtuple
 from pathlib import Path
-from typing import List, Set
+from typing import List
+
+import pytest
+import requests
+
+# The client module is imported once and driven in-process; spawning a
+# fresh interpreter per command cost ~100 ms × hundreds of moves.
+CLIENT_DIR = Path(__file__).parent / "client"
+if str(CLIENT_DIR) not in sys.path:
+    sys.path.insert(0, str(CLIENT_DIR))
+import battleship
+
+# One pooled session for the test's own HTTP traffic (readiness probes,
+# direct /state reads) – keep-alive instead of a new socket per request.
+# The in-process client runner reuses battleship's own pooled session.
+_SESSION = requests.Session()
+
+
+# ----------------------------------------------------------------------
+# requests-compatible facade over Flask's test client, so both the
+# battleship client and the test's own /state reads can run without a
+# server process or any sockets at all.
+# ----------------------------------------------------------------------
+class _ShimResponse:
+    """The slice of requests.Response the client actually touches."""
+
+    def __init__(self, resp):
+        self.status_code = resp.status_code
+        self.ok = resp.status_code < 400
+        self.content = resp.data
+        self.headers = resp.headers
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class _TestClientSession:
+    """Routes session.request/get calls into a Flask test client."""
+
+    def __init__(self, test_client):
+        self._client = test_client
+
+    def request(self, method, url, json=None, timeout=None, headers=None):
+        # Strip scheme+host – the test client only wants the path+query.
+        path = "/" + url.split("://", 1)[-1].split("/", 1)[1]
+        kwargs = {"method": method, "headers": headers}
+        if json is not None:
+            kwargs["json"] = json
+        return _ShimResponse(self._client.open(path, **kwargs))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+# ----------------------------------------------------------------------
+# Temp dirs on tmpfs when the platform offers it – every move rewrites
+# the game file, so keeping GAMES_ROOT (and the token/state caches) off
+# the block device removes disk I/O from the hot loop.
+# ----------------------------------------------------------------------
+_TMP_BASE = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+def _mkdtemp(prefix: str) -> str:
+    return tempfile.mkdtemp(prefix=prefix, dir=_TMP_BASE)
+
+# ----------------------------------------------------------------------
+# Output matchers – compiled once; the fire/sunk patterns run on every
+# move of the game loop.  _FIRE_RE captures the coordinate instead of
+# being rebuilt with re.escape(coord) per shot.
+# ----------------------------------------------------------------------
+_GAME_ID_RE = re.compile(r"ID\s*=\s*([a-z0-9]+)")
+_FIRE_RE = re.compile(r"You fired at\s+(\S+?):\s+(HIT|MISS)")
+_SUNK_RE = re.compile(r"🎉 You SUNK the opponent's (.+?)! 🎉")
+_SUNK_LIST_RE = re.compile(r"Opponent ships you have sunk:\s*(.*)")
+
+# Board-cell emojis a player can legitimately see at a fired coordinate
+_ALLOWED_BEFORE = frozenset({"❓", "🚢", "💥", "⚪", "🔥"})
+_ALLOWED_AFTER = frozenset({"💥", "⚪"}) | _ALLOWED_BEFORE
+
+# The 12×12 coordinate space and its (row, col) lookup, built once –
+# no per-move ord()/int() parsing in the game loop.
+ALL_COORDS = [
+    f"{chr(ord('A') + c)}{r+1}"
+    for r in range(12)
+    for c in range(12)
+]
+COORD_RC = {c: (int(c[1:]) - 1, ord(c[0]) - ord('A')) for c in ALL_COORDS}
 
 # ----------------------------------------------------------------------
 # Helper: find a free TCP port
@@ -31,7 +121,7 @@ def _launch_server(port: int):
     """
     env = os.environ.copy()
     env["PORT"] = str(port)               # server must read this env var
-    snap_common = tempfile.mkdtemp(prefix="snap_common_")
+    snap_common = _mkdtemp("snap_common_")
     env["SNAP_COMMON"] = snap_common
 
     server_path = Path(__file__).parent / "server" / "app.py"
@@ -49,46 +139,87 @@ def _launch_server(port: int):
 # Helper: wait until the server answers a simple request
 # ----------------------------------------------------------------------
 def _wait_for_server(port: int, timeout: float = 10.0) -> bool:
-    """Poll ``/games/start`` until we get a 201 or timeout."""
+    """Poll ``/games/start`` until we get a 201 or timeout.
+
+    Exponential backoff from 5 ms: a warm server is typically up within
+    ~50 ms, so readiness is detected almost immediately instead of at
+    200 ms granularity, while a slow start still backs off politely.
+    """
     deadline = time.time() + timeout
     url = f"http://127.0.0.1:{port}/games/start"
+    delay = 0.005
     while time.time() < deadline:
         try:
-            import requests
-            r = requests.post(url, timeout=0.5)
+            r = _SESSION.post(url, timeout=0.5)
             if r.status_code == 201:
                 return True
         except Exception:
             pass
-        time.sleep(0.2)
+        time.sleep(delay)
+        delay = min(delay * 2, 0.1)
     return False
 
+# Lightweight result shared by both client runners
+ClientResult = namedtuple("ClientResult", ["stdout", "stderr", "returncode"])
+
 # ----------------------------------------------------------------------
 # Helper: run a client command in an isolated HOME directory
 # ----------------------------------------------------------------------
-def _run_client(args: List[str], home_dir: Path, server_url: str) -> subprocess.CompletedProcess:
+def _run_client(args: List[str], home_dir: Path, server_url: str) -> ClientResult:
     """
     Executes ``battleship.py`` with the given arguments.
     ``home_dir`` becomes the $HOME for the subprocess so each player gets its own
     ``~/.battleship/current`` file.
-    Returns the CompletedProcess (stdout, stderr, returncode).
+    Returns a ClientResult (stdout, stderr, returncode).
     """
     env = os.environ.copy()
     env["HOME"] = str(home_dir)          # isolate token storage
     env["SERVER_URL"] = server_url       # point client at the test server
+    env["BATTLESHIP_STATE_TTL"] = "0"    # players alternate fast – no stale cache
     client_path = Path(__file__).parent / "client" / "battleship.py"
-    return subprocess.run(
-        [sys.executable, str(client_path)] + args,
-        env=env,
-        capture_output=True,
-        text=True,
-    )
+    # Spooled files instead of PIPE: no pipe pair per call and the
+    # emoji-heavy output is decoded in one pass rather than through the
+    # incremental text-mode decoder.
+    with tempfile.SpooledTemporaryFile(max_size=65536) as out, \
+         tempfile.SpooledTemporaryFile(max_size=65536) as err:
+        proc = subprocess.run(
+            [sys.executable, str(client_path)] + args,
+            env=env,
+            stdout=out,
+            stderr=err,
+        )
+        out.seek(0)
+        err.seek(0)
+        return ClientResult(
+            out.read().decode("utf-8", "replace"),
+            err.read().decode("utf-8", "replace"),
+            proc.returncode,
+        )
+
+# ----------------------------------------------------------------------
+# Helper: run a client command in-process (no interpreter startup)
+# ----------------------------------------------------------------------
+
+def _run_client_inproc(args: List[str], home_dir: Path, server_url: str) -> ClientResult:
+    """
+    Drive ``battleship.main`` directly, capturing its output.  Mirrors the
+    ``_run_client`` contract (stdout/stderr/returncode) so the game loop
+    can use either runner.
+    """
+    out, err = io.StringIO(), io.StringIO()
+    returncode = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            battleship.main(list(args), home=home_dir, server_url=server_url)
+        except SystemExit as exc:
+            returncode = exc.code or 0
+    return ClientResult(out.getvalue(), err.getvalue(), returncode)
 
 # ----------------------------------------------------------------------
 # Helper: extract the game‑id from the ``start`` output
 # ----------------------------------------------------------------------
 def _extract_game_id(output: str) -> str:
-    m = re.search(r"ID\s*=\s*([a-z0-9]+)", output)
+    m = _GAME_ID_RE.search(output)
     if not m:
         raise ValueError(f"Could not find game id in output:\n{output}")
     return m.group(1)
@@ -101,116 +232,132 @@ def _parse_board(status_output: str) -> List[List[str]]:
     Returns a 2‑dimensional list of emojis (rows × cols).
     Assumes the board is printed exactly as in ``_print_board``.
     """
-    lines = status_output.splitlines()
-    header_index = next(i for i, l in enumerate(lines) if l.startswith("   "))
-    board_lines = lines[header_index + 1 : header_index + 1 + 12]   # 12 rows
-    board = []
-    for line in board_lines:
-        parts = line.strip().split()
-        board.append(parts[1:])   # skip the row number
-    return board
+    # Locate the column-header line ("   A  B  …") directly in the raw
+    # string and split off just the 12 rows that follow it – no full
+    # splitlines() pass over the whole output.
+    if status_output.startswith("   "):
+        start = 0
+    else:
+        idx = status_output.find("\n   ")
+        if idx < 0:
+            raise ValueError(f"No board header in output:\n{status_output}")
+        start = idx + 1
+    board_lines = status_output[start:].split("\n", 13)[1:13]   # 12 rows
+    return [line.strip().split()[1:] for line in board_lines]   # skip row numbers
 
 # ----------------------------------------------------------------------
-# Integration test
+# The full game flow, parameterized over how client commands are run
 # ----------------------------------------------------------------------
-def test_full_game_flow():
+def _play_full_game(server_url: str, run_client, http=None):
     """
-    Spins up a server, creates two clients, plays a full game until a winner
-    appears, and checks that the output of ``fire`` and ``status`` matches
-    expectations.
+    Creates two clients, plays a full game until a winner appears, and
+    checks that the output of ``fire`` and ``status`` matches
+    expectations.  *run_client* is either the in-process or the
+    subprocess runner – both share the (args, home_dir, server_url)
+    call signature and result shape.  *http* is the session used for
+    the test's own /state reads (defaults to the real-HTTP session).
     """
+    http = http or _SESSION
+
     # --------------------------------------------------------------
-    # 1️⃣  Start the server on a random port
+    # Create two isolated HOME directories (one per player)
     # --------------------------------------------------------------
-    port = _free_port()
-    server_proc, snap_common_dir = _launch_server(port)
-    try:
-        assert _wait_for_server(port), "Server never became ready"
-        server_url = f"http://127.0.0.1:{port}/"
-
-        # --------------------------------------------------------------
-        # 2️⃣  Create two isolated HOME directories (one per player)
-        # --------------------------------------------------------------
-        home_a = Path(tempfile.mkdtemp(prefix="player_a_"))
-        home_b = Path(tempfile.mkdtemp(prefix="player_b_"))
+    home_a = Path(_mkdtemp("player_a_"))
+    home_b = Path(_mkdtemp("player_b_"))
 
+    try:
         # --------------------------------------------------------------
-        # 3️⃣  Player A starts a new game
+        # Player A starts a new game
         # --------------------------------------------------------------
-        res_start = _run_client(["start"], home_a, server_url)
+        res_start = run_client(["start"], home_a, server_url)
         assert res_start.returncode == 0, f"start failed: {res_start.stderr}"
         game_id = _extract_game_id(res_start.stdout)
 
         # --------------------------------------------------------------
-        # 4️⃣  Player B joins the same game
+        # Player B joins the same game
         # --------------------------------------------------------------
-        res_join = _run_client(["join", game_id], home_b, server_url)
+        res_join = run_client(["join", game_id], home_b, server_url)
         assert res_join.returncode == 0, f"join failed: {res_join.stderr}"
 
+
+        # --------------------------------------------------------------
+        # Per-player firing order: shuffle the full coordinate list once
+        # and pop() from it – sampling without replacement, so a player
+        # never repeats a shot and no per-move rebuild/scan is needed.
+        # --------------------------------------------------------------
+        shots = {home_a: ALL_COORDS.copy(), home_b: ALL_COORDS.copy()}
+        for order in shots.values():
+            random.shuffle(order)
+
+
         # --------------------------------------------------------------
-        # 5️⃣  Prepare per‑player fired‑sets (players may fire at the same
-        #     coordinate, but we avoid duplicate shots *by the same player*.
+        # Read each player's token once – the public /state endpoint
+        # reports whose turn it is (and the winner) by token, which
+        # replaces polling both players' private status every move.
         # --------------------------------------------------------------
-        fired_a: Set[str] = set()
-        fired_b: Set[str] = set()
-        all_coords = [
-            f"{chr(ord('A') + c)}{r+1}"
-            for r in range(12)
-            for c in range(12)
-        ]
+        token_a = json.loads((home_a / ".battleship" / "current").read_text())["token"]
+        token_b = json.loads((home_b / ".battleship" / "current").read_text())["token"]
+        state_url = f"{server_url}games/{game_id}/state"
 
         # --------------------------------------------------------------
-        # 6️⃣  Main play loop – keep going until a winner is announced
+        # Main play loop – keep going until a winner is announced
         # --------------------------------------------------------------
         winner_declared = False
         max_moves = 500   # generous safety net; the game will finish far sooner
-        for move_no in range(max_moves):
-            # ----- fetch status for both players -----
-            status_a = _run_client(["status"], home_a, server_url)
-            status_b = _run_client(["status"], home_b, server_url)
-            assert status_a.returncode == 0, f"A status error: {status_a.stderr}"
-            assert status_b.returncode == 0, f"B status error: {status_b.stderr}"
+        # The board printed by each player's last fire doubles as the
+        # "before" board of their next move, so a private status fetch
+        # only happens on a player's very first move.
+        last_board = {home_a: None, home_b: None}
+        expected_turn = None   # who must be on turn at the top of the loop
 
-            # ----- determine whose turn it is -----
-            turn_is_a = "Turn: you" in status_a.stdout
-            turn_is_b = "Turn: you" in status_b.stdout
-            assert turn_is_a != turn_is_b, "Both players think it's their turn!"
+        for move_no in range(max_moves):
+            # ----- one shared /state read: turn + winner -----
+            state = http.get(state_url, timeout=5).json()
 
             # ----- check for win/lose banners -----
-            if "🏆  You have WON the game!" in status_a.stdout:
-                winner_declared = True
-                assert "💀  You have LOST the game." in status_b.stdout
-                break
-            if "🏆  You have WON the game!" in status_b.stdout:
+            if state["winner"]:
                 winner_declared = True
-                assert "💀  You have LOST the game." in status_a.stdout
+                status_a = run_client(["status"], home_a, server_url)
+                status_b = run_client(["status"], home_b, server_url)
+                win_status, lose_status = (
+                    (status_a, status_b) if state["winner"] == token_a
+                    else (status_b, status_a)
+                )
+                assert "🏆  You have WON the game!" in win_status.stdout
+                assert "💀  You have LOST the game." in lose_status.stdout
                 break
 
-            # ----- pick a random coordinate that this player hasn't used yet -----
-            if turn_is_a:
-                available = [c for c in all_coords if c not in fired_a]
-                assert available, "Player A ran out of coordinates (should never happen)"
-                coord = random.choice(available)
-                fired_a.add(coord)
-                fire_res = _run_client(["fire", coord], home_a, server_url)
-                my_home = home_a
-                my_status_before = status_a
-            else:
-                available = [c for c in all_coords if c not in fired_b]
-                assert available, "Player B ran out of coordinates (should never happen)"
-                coord = random.choice(available)
-                fired_b.add(coord)
-                fire_res = _run_client(["fire", coord], home_b, server_url)
-                my_home = home_b
-                my_status_before = status_b
+            # ----- determine whose turn it is -----
+            turn_is_a = state["turn"] == token_a
+            assert turn_is_a or state["turn"] == token_b, "Turn belongs to neither player!"
+            if expected_turn is not None:
+                assert state["turn"] == expected_turn, "Turn did not switch after fire"
+
+            # ----- next coordinate from this player's shuffled order -----
+            my_home = home_a if turn_is_a else home_b
+            assert shots[my_home], "Player ran out of coordinates (should never happen)"
+            coord = shots[my_home].pop()
+
+            # Previous fire output gives us the "before" board; only the
+            # very first move of each player needs a status fetch.
+            board_before = last_board[my_home]
+            if board_before is None:
+                status_before = run_client(["status"], my_home, server_url)
+                assert status_before.returncode == 0, f"status error: {status_before.stderr}"
+                board_before = _parse_board(status_before.stdout)
+
+            fire_res = run_client(["fire", coord], my_home, server_url)
 
             # ----- fire must succeed and report HIT or MISS -----
             assert fire_res.returncode == 0, f"fire failed: {fire_res.stderr}"
-            assert re.search(rf"You fired at\s+{re.escape(coord)}:\s+(HIT|MISS)", fire_res.stdout), \
+            fire_match = _FIRE_RE.search(fire_res.stdout)
+            assert fire_match and fire_match.group(1) == coord, \
                 f"Unexpected fire output:\n{fire_res.stdout}"
+            expected_turn = token_b if my_home == home_a else token_a
 
-            # ----- if a ship was sunk, verify the celebratory line appears -----
-            sunk_match = re.search(r"🎉 You SUNK the opponent's (.+?)! 🎉", fire_res.stdout)
+            # ----- if a ship was sunk, verify the banner and that the
+            #       sunk list in status reflects it (rare path) -----
+            sunk_match = _SUNK_RE.search(fire_res.stdout)
             if sunk_match:
                 sunk_name = sunk_match.group(1)
                 assert sunk_name in {
@@ -218,31 +365,29 @@ def test_full_game_flow():
                     "Destroyer", "Patrol Boat"
                 }, f"Unexpected sunk name: {sunk_name}"
 
-            # ----- after the move, fetch status again and verify turn switched -----
-            post_status = _run_client(["status"], my_home, server_url)
-            # After retrieving the status output for the player who just moved:
-            if "Opponent ships you have sunk:" in post_status.stdout:
-                # Extract the list that follows the colon
-                sunk_line = re.search(r"Opponent ships you have sunk:\s*(.*)", post_status.stdout)
-                if sunk_line:
-                    sunk_list = [s.strip() for s in sunk_line.group(1).split(",") if s.strip()]
-                # The list should contain at least the ship we just sunk (if any)
-                    if sunk_match:   # we already captured the ship name from the fire output
-                        expected_name = sunk_match.group(1)
-                        assert expected_name in sunk_list, (
-                            f"Sunk ship '{expected_name}' not listed in status output:\n{post_status.stdout}"
-                        )
-
-            assert post_status.returncode == 0
-            # The turn must now belong to the opponent
-            assert ("Turn: you" in post_status.stdout) == False, "Turn did not switch after fire"
+                post_status = run_client(["status"], my_home, server_url)
+                assert post_status.returncode == 0
+                sunk_line = _SUNK_LIST_RE.search(post_status.stdout)
+                assert sunk_line, f"No sunk list in status output:\n{post_status.stdout}"
+                sunk_list = [s.strip() for s in sunk_line.group(1).split(",") if s.strip()]
+                assert sunk_name in sunk_list, (
+                    f"Sunk ship '{sunk_name}' not listed in status output:\n{post_status.stdout}"
+                )
 
             # ----- sanity check: board contains the new hit/miss emoji -----
-            board_before = _parse_board(my_status_before.stdout)
-            board_after = _parse_board(post_status.stdout)
+            # Misses dominate the early game and barely change the board;
+            # parse and validate it only on hits and sinkings, plus every
+            # 10th move as a sampled check on the miss path.
+            outcome = fire_match.group(2)
+            if outcome != "HIT" and not sunk_match and move_no % 10 != 0:
+                continue
 
-            col_idx = ord(coord[0].upper()) - ord('A')
-            row_idx = int(coord[1:]) - 1
+            # The fire command prints the refreshed board – reuse it
+            # instead of fetching another status.
+            board_after = _parse_board(fire_res.stdout)
+            last_board[my_home] = board_after
+
+            row_idx, col_idx = COORD_RC[coord]
             before_cell = board_before[row_idx][col_idx]
             after_cell = board_after[row_idx][col_idx]
 
@@ -252,13 +397,13 @@ def test_full_game_flow():
             #   💥 a previous hit we already made
             #   ⚪ a previous miss we already made
             # The only thing we *cannot* see is the opponent’s ship (it is never shown).
-            allowed_before = {"❓", "🚢", "💥", "⚪", "🔥"}
+            allowed_before = _ALLOWED_BEFORE
             assert before_cell in allowed_before, (
                 f"Cell {coord} had unexpected content before fire: {before_cell}"
             )
 
             # AFTER the move it must be either a hit (💥) or a miss (⚪)
-            allowed_after = {"💥", "⚪"} | allowed_before
+            allowed_after = _ALLOWED_AFTER
             assert after_cell in allowed_after, (
                 f"Cell {coord} after fire is {after_cell}, expected one of {sorted(allowed_after)}"
             )
@@ -269,11 +414,54 @@ def test_full_game_flow():
         assert winner_declared, "The game finished without a winner (should be impossible on a 12×12 board)"
 
     finally:
-        # Clean up: terminate server and delete temporary dirs
+        shutil.rmtree(home_a, ignore_errors=True)
+        shutil.rmtree(home_b, ignore_errors=True)
+
+# ----------------------------------------------------------------------
+# Integration tests – in-process by default, full subprocess stack on
+# demand (E2E=1)
+# ----------------------------------------------------------------------
+def test_full_game_flow():
+    """
+    Plays a full game entirely in-process: the battleship client drives
+    Flask's test client through a session shim, so no server process,
+    sockets, or HTTP parsing are involved.
+    """
+    SERVER_DIR = Path(__file__).parent / "server"
+    if str(SERVER_DIR) not in sys.path:
+        sys.path.insert(0, str(SERVER_DIR))
+    import app as server_app
+
+    games_dir = Path(_mkdtemp("games_"))
+    shim = _TestClientSession(server_app.app.test_client())
+
+    saved = (server_app.GAMES_ROOT, battleship._SESSION, battleship.STATE_CACHE_TTL)
+    server_app.GAMES_ROOT = games_dir
+    battleship._SESSION = shim
+    # Players alternate within milliseconds – a TTL would serve stale turns
+    battleship.STATE_CACHE_TTL = 0.0
+    try:
+        _play_full_game("http://testserver/", _run_client_inproc, http=shim)
+    finally:
+        server_app.GAMES_ROOT, battleship._SESSION, battleship.STATE_CACHE_TTL = saved
+        shutil.rmtree(games_dir, ignore_errors=True)
+
+
+@pytest.mark.skipif(os.getenv("E2E") != "1",
+                    reason="slow full-stack run (one subprocess per command); set E2E=1 to enable")
+def test_full_game_flow_e2e():
+    """Same game flow, but through real client subprocesses."""
+    port = _free_port()
+    server_proc, snap_common_dir = _launch_server(port)
+    try:
+        assert _wait_for_server(port), "Server never became ready"
+        _play_full_game(f"http://127.0.0.1:{port}/", _run_client)
+    finally:
         server_proc.terminate()
         server_proc.wait(timeout=5)
         shutil.rmtree(snap_common_dir, ignore_errors=True)
 
+
 # ----------------------------------------------------------------------
 # If the file is executed directly, run the test (useful for quick dev runs)
 # ----------------------------------------------------------------------